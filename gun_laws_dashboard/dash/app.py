@@ -21,6 +21,8 @@ from dash import dash_table
 from dash.dash_table.Format import Format, Scheme
 from dash.dependencies import Input, Output, State
 
+from panel_api import register_panel_api
+
 
 # %%
 # Load markdown and css files
@@ -179,6 +181,9 @@ fig_feature_correlations = graph_feature_correlations(df)
 #
 app = dash.Dash(__name__, external_stylesheets=external_stylesheets)
 
+# JSON query API for downstream tools: /api/panel and /api/panel/meta
+register_panel_api(app.server, df_raw)
+
 
 # Create each tab separately (to avoid heavy indentation in app.layout, and make rearranging easier)
 
@@ -0,0 +1,114 @@
+#
+# Local load test for the /api/panel endpoint (see panel_api.py).
+#
+# Start the dashboard (python app.py), then in another shell:
+#
+#   python load_test_api.py --url http://127.0.0.1:8050 --requests 5000 --concurrency 16 --min-rps 200
+#
+# Fires a mix of state / year-range / column / pagination queries from a thread
+# pool, then reports throughput and latency percentiles. Exits non-zero on any
+# failed request or if throughput falls below --min-rps.
+#
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+import numpy as np
+
+
+def fetch(url, headers=None):
+    req = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            body = resp.read()
+            if resp.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            return resp.status, resp.headers.get('ETag'), body
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers.get('ETag'), b''
+
+
+def make_queries(meta, n, seed=0):
+    """Build a reproducible mix of realistic queries from the panel's metadata."""
+    rng = random.Random(seed)
+    states, columns = meta['states'], meta['columns']
+    y0, y1 = meta['year_min'], meta['year_max']
+    queries = []
+    for _ in range(n):
+        params = {}
+        if rng.random() < 0.8:
+            params['state'] = ','.join(rng.sample(states, rng.randint(1, 5)))
+        if rng.random() < 0.7:
+            lo = rng.randint(y0, y1)
+            params['year_min'], params['year_max'] = lo, rng.randint(lo, y1)
+        if rng.random() < 0.7:
+            params['columns'] = ','.join(rng.sample(columns, rng.randint(1, 6)))
+        if rng.random() < 0.3:
+            params['limit'], params['offset'] = 50, rng.choice([0, 50, 100])
+        queries.append(params)
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the panel query API')
+    parser.add_argument('--url', default='http://127.0.0.1:8050', help='Server base URL [default: http://127.0.0.1:8050]')
+    parser.add_argument('--route', default='/api/panel', help='API route [default: /api/panel]')
+    parser.add_argument('--requests', type=int, default=5000, help='Total requests to send [default: 5000]')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client threads [default: 16]')
+    parser.add_argument('--distinct', type=int, default=500, help='Distinct queries in the mix [default: 500]')
+    parser.add_argument('--min-rps', type=float, default=200, help='Fail below this throughput [default: 200]')
+    args = parser.parse_args()
+
+    base = args.url.rstrip('/') + args.route
+    status, _, body = fetch(f'{base}/meta')
+    if status != 200:
+        print(f"Error: {base}/meta returned {status}", file=sys.stderr)
+        sys.exit(1)
+    meta = json.loads(body)
+
+    pool_queries = make_queries(meta, args.distinct)
+    rng = random.Random(1)
+    plan = [rng.choice(pool_queries) for _ in range(args.requests)]
+
+    def one(params):
+        # Half the clients ask for gzip, a tenth revalidate with an ETag
+        headers = {'Accept-Encoding': 'gzip'} if rng.random() < 0.5 else {}
+        url = f'{base}?{urlencode(params)}'
+        start = time.perf_counter()
+        status, etag, _ = fetch(url, headers)
+        if status == 200 and etag and rng.random() < 0.1:
+            status, _, _ = fetch(url, {'If-None-Match': etag})
+        return status, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(one, plan))
+    elapsed = time.perf_counter() - start
+
+    statuses = np.array([s for s, _ in results])
+    latency_ms = np.array([t for _, t in results]) * 1000
+    failures = int(np.sum(~np.isin(statuses, [200, 304])))
+    rps = len(results) / elapsed
+
+    print(f"Requests:    {len(results)} ({args.concurrency} concurrent, {len(pool_queries)} distinct queries)")
+    print(f"Failures:    {failures}")
+    print(f"Throughput:  {rps:.0f} req/s")
+    print("Latency ms:  p50 {:.1f}  p95 {:.1f}  p99 {:.1f}  max {:.1f}".format(
+        *np.percentile(latency_ms, [50, 95, 99]), latency_ms.max()))
+
+    if failures or rps < args.min_rps:
+        print(f"FAIL: need 0 failures and >= {args.min_rps:.0f} req/s", file=sys.stderr)
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == '__main__':
+    main()
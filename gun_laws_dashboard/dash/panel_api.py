@@ -0,0 +1,208 @@
+#
+# JSON query API over the state-year panel, mounted on the Dash app's Flask server.
+#
+#   GET /api/panel?state=CA,TX&year_min=2018&year_max=2023&columns=rate,deaths&limit=100&offset=0
+#   GET /api/panel/meta
+#
+# Rows are kept sorted by (state, year) with a per-state row range, so a query
+# is answered by binary-searching each requested state's years and projecting
+# only the requested columns; the full frame is never scanned or serialized.
+# Responses carry an ETag per content-coding (304 on If-None-Match) and are
+# gzipped on request.
+#
+
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from flask import Response, request
+
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+GZIP_MIN_BYTES = 1024
+CACHE_SIZE = 1024
+
+
+class QueryError(ValueError):
+    """Raised for a malformed or unsatisfiable query; reported as HTTP 400."""
+
+
+class PanelIndex:
+    """(state, year) index with column projection over the panel."""
+
+    def __init__(self, df, state_col='state', year_col='year'):
+        self.state_col = state_col
+        self.year_col = year_col
+        self.df = df.sort_values([state_col, year_col], kind='stable').reset_index(drop=True)
+        self.columns = list(self.df.columns)
+        self._col_pos = {col: i for i, col in enumerate(self.columns)}
+
+        states = self.df[state_col].astype(str).str.upper().to_numpy()
+        self.years = self.df[year_col].to_numpy(dtype='int64')
+
+        # Each state's rows are contiguous after sorting: keep [start, stop)
+        boundaries = np.flatnonzero(states[1:] != states[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        stops = np.concatenate([boundaries, [len(states)]])
+        self.state_ranges = {states[a]: (a, b) for a, b in zip(starts, stops)}
+
+        digest = hashlib.sha1(pd.util.hash_pandas_object(self.df, index=False).values.tobytes())
+        digest.update('|'.join(map(str, self.columns)).encode())
+        self.version = digest.hexdigest()[:16]
+
+    def positions(self, states=None, year_min=None, year_max=None):
+        """Row positions matching the filters, in (state, year) order."""
+        if states is None:
+            states = self.state_ranges.keys()
+        unknown = [s for s in states if s not in self.state_ranges]
+        if unknown:
+            raise QueryError(f"Unknown state(s): {', '.join(unknown)}")
+
+        ranges = []
+        for state in states:
+            start, stop = self.state_ranges[state]
+            years = self.years[start:stop]
+            lo = start if year_min is None else start + np.searchsorted(years, year_min, side='left')
+            hi = stop if year_max is None else start + np.searchsorted(years, year_max, side='right')
+            if hi > lo:
+                ranges.append(np.arange(lo, hi))
+        return np.concatenate(ranges) if ranges else np.empty(0, dtype='int64')
+
+    def records_json(self, positions, columns):
+        """Serialize only the selected rows and columns to a JSON array."""
+        col_idx = [self._col_pos[col] for col in columns]
+        return self.df.iloc[positions, col_idx].to_json(orient='records')
+
+    def meta(self):
+        return {
+            'version': self.version,
+            'rows': len(self.df),
+            'columns': self.columns,
+            'states': sorted(self.state_ranges),
+            'year_min': int(self.years.min()),
+            'year_max': int(self.years.max()),
+        }
+
+
+def _split(values):
+    """Accept both ?state=CA,TX and ?state=CA&state=TX."""
+    return [v.strip() for value in values for v in value.split(',') if v.strip()]
+
+
+def _int_arg(args, name, default=None):
+    value = args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise QueryError(f"'{name}' must be an integer, got {value!r}")
+
+
+def parse_query(args, index):
+    """Normalize request args into a hashable query key."""
+    states = _split(args.getlist('state'))
+    states = tuple(dict.fromkeys(s.upper() for s in states)) or None
+
+    columns = _split(args.getlist('columns'))
+    unknown = [col for col in columns if col not in index._col_pos]
+    if unknown:
+        raise QueryError(f"Unknown column(s): {', '.join(unknown)}")
+    # Always return the key columns so rows stay identifiable
+    keys = [index.state_col, index.year_col]
+    columns = tuple(dict.fromkeys(keys + columns)) if columns else tuple(index.columns)
+
+    year_min = _int_arg(args, 'year_min')
+    year_max = _int_arg(args, 'year_max')
+    if year_min is not None and year_max is not None and year_min > year_max:
+        raise QueryError("'year_min' must not exceed 'year_max'")
+
+    limit = _int_arg(args, 'limit', DEFAULT_LIMIT)
+    offset = _int_arg(args, 'offset', 0)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise QueryError(f"'limit' must be between 1 and {MAX_LIMIT}")
+    if offset < 0:
+        raise QueryError("'offset' must be >= 0")
+
+    return states, year_min, year_max, columns, limit, offset
+
+
+def register_panel_api(server, df, route='/api/panel', state_col='state', year_col='year'):
+    """Mount the panel query endpoints on a Flask `server` (e.g. app.server)."""
+    index = PanelIndex(df, state_col=state_col, year_col=year_col)
+
+    # Small LRU of rendered responses keyed by the normalized query
+    cache = OrderedDict()
+    lock = threading.Lock()
+
+    def render(query):
+        with lock:
+            if query in cache:
+                cache.move_to_end(query)
+                return cache[query]
+
+        states, year_min, year_max, columns, limit, offset = query
+        positions = index.positions(states, year_min, year_max)
+        total = len(positions)
+        page = positions[offset:offset + limit]
+        next_offset = offset + limit if offset + limit < total else None
+
+        header = json.dumps({
+            'version': index.version,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'next_offset': next_offset,
+            'columns': list(columns),
+        })
+        body = f'{header[:-1]}, "data": {index.records_json(page, columns)}}}'.encode()
+        etag = '{}-{}'.format(index.version, hashlib.sha1(repr(query).encode()).hexdigest()[:16])
+        gzipped = gzip.compress(body, compresslevel=5) if len(body) >= GZIP_MIN_BYTES else None
+
+        with lock:
+            cache[query] = (etag, body, gzipped)
+            if len(cache) > CACHE_SIZE:
+                cache.popitem(last=False)
+        return etag, body, gzipped
+
+    def respond(etag, body, gzipped):
+        # Each content-coding gets its own strong validator (RFC 9110 8.8.3)
+        headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        gz_etag = f'{etag}-gz'
+        use_gzip = gzipped is not None and 'gzip' in request.accept_encodings
+
+        # A client may revalidate with either form; answer with the one it gets now
+        if request.if_none_match.contains(etag) or request.if_none_match.contains(gz_etag):
+            response = Response(status=304, headers=headers)
+        elif use_gzip:
+            headers['Content-Encoding'] = 'gzip'
+            response = Response(gzipped, mimetype='application/json', headers=headers)
+        else:
+            response = Response(body, mimetype='application/json', headers=headers)
+        response.set_etag(gz_etag if use_gzip else etag)
+        return response
+
+    def error(message, status=400):
+        return Response(json.dumps({'error': message}), status=status, mimetype='application/json')
+
+    @server.route(route, methods=['GET'])
+    def panel_query():
+        try:
+            query = parse_query(request.args, index)
+            return respond(*render(query))
+        except QueryError as e:
+            return error(str(e))
+
+    meta_body = json.dumps(index.meta()).encode()
+    meta_etag = f'{index.version}-meta'
+
+    @server.route(f'{route}/meta', methods=['GET'])
+    def panel_meta():
+        return respond(meta_etag, meta_body, None)
+
+    return index
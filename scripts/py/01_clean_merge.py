@@ -2,22 +2,65 @@
 
 """
 Clean and merge mortality and firearm law data.
+
+Usage:
+    python scripts/py/01_clean_merge.py \
+        --mortality "Data/raw/data-table.csv" \
+        --laws "Data/raw/TL-A243-2-v3 State Firearm Law Database 5.0.xlsx" \
+        --out "Data/processed/firearm_data_cleaned_new_py.csv"
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import sys
 
+from exposure import build_exposure_matrix, save_exposure_matrix
+from geography import normalize_state, state_abbrev, state_name
+from panel_io import clean_names, load_laws
+
 
 def main():
+    parser = argparse.ArgumentParser(
+        description='Clean and merge mortality and firearm law data'
+    )
+    parser.add_argument(
+        '--mortality',
+        type=str,
+        default='Data/raw/data-table.csv',
+        help='Mortality CSV (CDC) [default: Data/raw/data-table.csv]'
+    )
+    parser.add_argument(
+        '--laws',
+        type=str,
+        default='Data/raw/TL-A243-2-v3 State Firearm Law Database 5.0.xlsx',
+        help='Firearm law workbook, or a CSV export of its Database sheet '
+             '[default: Data/raw/TL-A243-2-v3 State Firearm Law Database 5.0.xlsx]'
+    )
+    parser.add_argument(
+        '--out',
+        type=str,
+        default='Data/processed/firearm_data_cleaned_new_py.csv',
+        help='Output panel CSV [default: Data/processed/firearm_data_cleaned_new_py.csv]'
+    )
+    parser.add_argument(
+        '--sparse-dir',
+        type=str,
+        default='Data/processed/sparse',
+        help='Output directory for sparse exposure matrices [default: Data/processed/sparse]'
+    )
+
+    args = parser.parse_args()
+
     # ---------- Inputs ----------
-    raw_mortality = Path('Data/raw/data-table.csv')
-    raw_laws_xlsx = Path('Data/raw/TL-A243-2-v3 State Firearm Law Database 5.0.xlsx')
+    raw_mortality = Path(args.mortality)
+    raw_laws_xlsx = Path(args.laws)
     laws_sheet = 'Database'
     
     # ---------- Output ----------
-    out_path = Path('Data/processed/firearm_data_cleaned_new_py.csv')
+    out_path = Path(args.out)
+    sparse_dir = Path(args.sparse_dir)
     
     # ---------- Load ----------
     if not raw_mortality.exists():
@@ -29,11 +72,10 @@ def main():
     
     print("Loading data...")
     mortality_data = pd.read_csv(raw_mortality)
-    law_data = pd.read_excel(raw_laws_xlsx, sheet_name=laws_sheet)
+    # Column names are snake-cased on load (e.g. "Law Class (num)" -> "law_class_num")
+    law_data = load_laws(raw_laws_xlsx, sheet=laws_sheet)
     
     # ---------- Prep ----------
-    # Clean column names (lowercase, replace spaces with underscores)
-    law_data.columns = law_data.columns.str.lower().str.replace(' ', '_')
     
     # Keep specific columns
     law_data2 = law_data[[
@@ -42,27 +84,11 @@ def main():
         'effect', 'type_of_change'
     ]].copy()
     
-    # Map state abbreviations to full names
-    # Create mapping dictionary from state abbreviations to full names
-    state_abbrev_to_name = {
-        'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas',
-        'CA': 'California', 'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware',
-        'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii', 'ID': 'Idaho',
-        'IL': 'Illinois', 'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas',
-        'KY': 'Kentucky', 'LA': 'Louisiana', 'ME': 'Maine', 'MD': 'Maryland',
-        'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota', 'MS': 'Mississippi',
-        'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada',
-        'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York',
-        'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma',
-        'OR': 'Oregon', 'PA': 'Pennsylvania', 'RI': 'Rhode Island', 'SC': 'South Carolina',
-        'SD': 'South Dakota', 'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah',
-        'VT': 'Vermont', 'VA': 'Virginia', 'WA': 'Washington', 'WV': 'West Virginia',
-        'WI': 'Wisconsin', 'WY': 'Wyoming', 'DC': 'District of Columbia'
-    }
-    
-    mortality_data['STATE_NAME'] = mortality_data['STATE'].str.upper().map(state_abbrev_to_name)
-    # Fill DC if not already mapped
-    mortality_data['STATE_NAME'] = mortality_data['STATE_NAME'].fillna('District of Columbia')
+    # Resolve states to integer FIPS codes (shared categorical dtype) so every
+    # join below is an integer-key join; unknown or missing codes raise
+    mortality_data['state_fips'] = normalize_state(mortality_data['STATE'])
+    mortality_data['STATE_NAME'] = state_name(mortality_data['state_fips'])
+    law_data2['state_fips'] = normalize_state(law_data2['state'])
     
     # Convert "DEATHS" column to numeric (remove non-numeric characters)
     mortality_data['DEATHS'] = pd.to_numeric(
@@ -75,8 +101,8 @@ def main():
         law_data2[col] = law_data2[col].astype(str).str.strip().str.title()
     
     # Create state-year grid based on mortality data
-    state_year_grid = mortality_data[['STATE_NAME', 'YEAR']].drop_duplicates()
-    state_year_grid = state_year_grid.rename(columns={'STATE_NAME': 'state', 'YEAR': 'year'})
+    state_year_grid = mortality_data[['state_fips', 'YEAR']].drop_duplicates()
+    state_year_grid = state_year_grid.rename(columns={'YEAR': 'year'})
     
     # ---------- Scoring ----------
     print("Calculating law strength scores...")
@@ -112,9 +138,9 @@ def main():
     
     # Merge state_year_grid with law_scores (many-to-many)
     law_year_merged = state_year_grid.merge(
-        law_scores[['law_id', 'state', 'effective_date_year', 'law_class', 
+        law_scores[['law_id', 'state_fips', 'effective_date_year', 'law_class', 
                    'law_class_subtype', 'effect', 'type_of_change', 'law_score']],
-        on='state',
+        on='state_fips',
         how='left'
     )
     
@@ -124,8 +150,20 @@ def main():
         (law_year_merged['effective_date_year'].isna())
     ]
     
+    # ---------- Sparse exposure matrices ----------
+    # Subtype and per-law exposure are too wide and mostly zero to pivot densely,
+    # so export them as state-year x subtype / law_id CSR matrices instead
+    print("Exporting sparse subtype and law exposure matrices...")
+    exposure_rows = state_year_grid.sort_values(['state_fips', 'year']).reset_index(drop=True)
+    exposure_rows.insert(1, 'state', state_abbrev(exposure_rows['state_fips']))
+    active_laws = law_year_merged.replace({'law_class_subtype': {'Nan': np.nan}})
+    for key in ['law_class_subtype', 'law_id']:
+        matrix, columns = build_exposure_matrix(active_laws, exposure_rows, key, state_col='state_fips')
+        save_exposure_matrix(sparse_dir / f'exposure_{key}', matrix, exposure_rows, columns)
+        print(f"Wrote: {sparse_dir / f'exposure_{key}'}.npz ({matrix.shape[0]} x {matrix.shape[1]}, nnz={matrix.nnz})")
+    
     # Calculate aggregated law strength by state and year
-    law_strength_by_year = law_year_merged.groupby(['state', 'year']).agg(
+    law_strength_by_year = law_year_merged.groupby(['state_fips', 'year'], observed=True).agg(
         law_strength_score=('law_score', 'sum'),
         restrictive_laws=('law_score', lambda x: (x == 1).sum()),
         permissive_laws=('law_score', lambda x: (x == -1).sum()),
@@ -137,8 +175,8 @@ def main():
     print("Creating law class features...")
     
     law_class_merged = state_year_grid.merge(
-        law_scores[['law_id', 'state', 'effective_date_year', 'law_class', 'law_score']],
-        on='state',
+        law_scores[['law_id', 'state_fips', 'effective_date_year', 'law_class', 'law_score']],
+        on='state_fips',
         how='left'
     )
     
@@ -147,29 +185,31 @@ def main():
         (law_class_merged['effective_date_year'].isna())
     ]
     
-    law_strength_by_class = law_class_merged.groupby(['state', 'year', 'law_class']).agg(
+    law_strength_by_class = law_class_merged.groupby(['state_fips', 'year', 'law_class'], observed=True).agg(
         class_strength=('law_score', 'sum')
     ).reset_index()
     
     # Pivot to wide format
     law_strength_by_class_wide = law_strength_by_class.pivot_table(
-        index=['state', 'year'],
+        index=['state_fips', 'year'],
         columns='law_class',
         values='class_strength',
-        fill_value=0
+        fill_value=0,
+        observed=True
     ).reset_index()
     
     # Clean column names (add prefix and lowercase)
     law_strength_by_class_wide.columns = [
-        col if col in ['state', 'year'] else f'strength_{col}'.lower().replace(' ', '_')
+        col if col in ['state_fips', 'year'] else f'strength_{col}'
         for col in law_strength_by_class_wide.columns
     ]
+    law_strength_by_class_wide.columns = clean_names(law_strength_by_class_wide.columns)
 
     
     # Combine all law strength measures
     law_strength_final = law_strength_by_year.merge(
         law_strength_by_class_wide,
-        on=['state', 'year'],
+        on=['state_fips', 'year'],
         how='left'
     )
     
@@ -177,14 +217,15 @@ def main():
     print("Merging with mortality data...")
     
     gun_data_final = mortality_data.merge(
-        law_strength_final,
-        left_on=['STATE_NAME', 'YEAR'],
-        right_on=['state', 'year'],
+        law_strength_final.rename(columns={'year': 'YEAR'}),
+        on=['state_fips', 'YEAR'],
         how='left'
     )
+    # Output keeps the R schema: STATE (abbreviation) becomes `state`, no FIPS column
+    gun_data_final = gun_data_final.drop(columns=['state_fips'])
     
     # Clean column names (lowercase, replace spaces)
-    gun_data_final.columns = gun_data_final.columns.str.lower().str.replace(' ', '_')
+    gun_data_final.columns = clean_names(gun_data_final.columns)
     
     # Remove URL column if exists and convert types
     if 'url' in gun_data_final.columns:
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+
+"""
+Headless EDA report for the processed state-year panel.
+
+Batch version of eda.py for unattended runs: every aggregate is computed in a
+single pass over the panel and cached, each figure is rendered to its own file
+in a process pool with the non-interactive Agg backend, and figures whose
+inputs have not changed since the last run are skipped.
+
+Usage:
+    python scripts/py/eda_report.py \
+        --input "Data/processed/firearm_data_cleaned.csv" \
+        --jobs 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from panel_io import load_panel
+
+
+KEY_VARS = ['year', 'rate', 'deaths', 'law_strength_score', 'restrictive_laws', 'permissive_laws']
+DIST_VARS = ['rate', 'deaths', 'law_strength_score', 'restrictive_laws', 'permissive_laws']
+CORR_VARS = ['year', 'rate', 'law_strength_score', 'restrictive_laws', 'permissive_laws']
+NA_VARS = ['state_name', 'year', 'deaths', 'rate', 'law_strength_score', 'restrictive_laws', 'permissive_laws']
+
+# Bump to force every figure to re-render after a change to the plotting code
+RENDER_VERSION = 1
+# Bump to invalidate the aggregate cache after a change to compute_aggregates()
+# or the variable lists above
+AGGREGATE_VERSION = 1
+
+
+# ---------- Aggregates ----------
+def compute_aggregates(df):
+    """Compute every table the report needs from one grouping per key."""
+    by_state = df.groupby('state_name', observed=True).agg(
+        rate=('rate', 'mean'),
+        law_strength_score=('law_strength_score', 'mean'),
+        n_years=('year', 'size')
+    )
+    by_year = df.groupby('year').agg(
+        rate_mean=('rate', 'mean'),
+        rate_sem=('rate', 'sem'),
+        strength_mean=('law_strength_score', 'mean'),
+        strength_sem=('law_strength_score', 'sem'),
+        n_states=('state_name', 'size')
+    )
+
+    rate_by_state = by_state['rate'].sort_values(ascending=False)
+    strength_by_state = by_state['law_strength_score'].sort_values(ascending=False)
+
+    return {
+        'summary': df[KEY_VARS].describe(),
+        'na_counts': df[NA_VARS].isna().sum().rename('n_missing').to_frame(),
+        'year_counts': by_year['n_states'],
+        'state_counts': by_state['n_years'],
+        'correlation': df[CORR_VARS].corr(),
+        'by_year': by_year,
+        'rate_by_state_top': rate_by_state.head(10),
+        'rate_by_state_bottom': rate_by_state.tail(10),
+        'strength_by_state_top': strength_by_state.head(10),
+        'strength_by_state_bottom': strength_by_state.tail(10),
+    }
+
+
+def load_or_compute_aggregates(df, source_hash, cache_path):
+    """Reuse cached aggregates when the panel is byte-for-byte unchanged and
+    the aggregate code is at the same AGGREGATE_VERSION."""
+    cache_key = f'{source_hash}:{AGGREGATE_VERSION}'
+    if cache_path.exists():
+        # A truncated cache, or one pickled by another pandas/Python, is just a miss
+        try:
+            with open(cache_path, 'rb') as file:
+                cached = pickle.load(file)
+            if cached.get('cache_key') == cache_key:
+                return cached['aggregates'], True
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable aggregate cache {cache_path}: {e}", file=sys.stderr)
+
+    aggregates = compute_aggregates(df)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, 'wb') as file:
+        pickle.dump({'cache_key': cache_key, 'aggregates': aggregates}, file)
+    return aggregates, False
+
+
+# ---------- Plotters ----------
+# Each plotter draws onto its own axes so figures never share state.
+def plot_countplot(data, ax):
+    ax.bar(data.index.astype(str), data.values)
+    ax.set(xlabel=data.index.name, ylabel='Count')
+    ax.tick_params(axis='x', labelrotation=90)
+
+
+def plot_distribution(data, ax):
+    sns.histplot(data.dropna(), kde=True, ax=ax)
+    ax.set(xlabel=data.name)
+
+
+def plot_rate_boxplot(data, ax):
+    sns.boxplot(x='year', y='rate', data=data, ax=ax)
+
+
+def plot_heatmap(data, ax):
+    sns.heatmap(data, annot=True, cmap='coolwarm', ax=ax)
+
+
+def plot_state_bars(data, ax):
+    sns.barplot(x=data.values, y=data.index, orient='h', ax=ax)
+    label = 'Average Firearm Death Rate' if data.name == 'rate' else 'Average Law Strength Score'
+    ax.set(xlabel=label, ylabel='State')
+
+
+def plot_yearly_mean(data, ax):
+    mean, sem, label = data['mean'], data['sem'], data.columns.name
+    ax.plot(mean.index, mean.values, marker='o')
+    ax.fill_between(mean.index, mean - 1.96 * sem, mean + 1.96 * sem, alpha=0.2)
+    ax.set(xlabel='Year', ylabel=label)
+
+
+def plot_scatter(data, ax):
+    sns.scatterplot(x='law_strength_score', y='rate', data=data, ax=ax)
+
+
+def figure_specs(df, aggregates):
+    """Map each output figure to its plotter and the data it depends on."""
+    by_year = aggregates['by_year']
+
+    def yearly(prefix, label):
+        frame = by_year[[f'{prefix}_mean', f'{prefix}_sem']].set_axis(['mean', 'sem'], axis=1)
+        frame.columns.name = label
+        return frame
+
+    specs = {
+        'count_year': (plot_countplot, aggregates['year_counts']),
+        'count_state': (plot_countplot, aggregates['state_counts']),
+        'box_rate_by_year': (plot_rate_boxplot, df[['year', 'rate']]),
+        'correlation_heatmap': (plot_heatmap, aggregates['correlation']),
+        'rate_by_state_top': (plot_state_bars, aggregates['rate_by_state_top']),
+        'rate_by_state_bottom': (plot_state_bars, aggregates['rate_by_state_bottom']),
+        'strength_by_state_top': (plot_state_bars, aggregates['strength_by_state_top']),
+        'strength_by_state_bottom': (plot_state_bars, aggregates['strength_by_state_bottom']),
+        'rate_over_time': (plot_yearly_mean, yearly('rate', 'Average Firearm Death Rate')),
+        'strength_over_time': (plot_yearly_mean, yearly('strength', 'Average Law Strength Score')),
+        'strength_vs_rate': (plot_scatter, df[['law_strength_score', 'rate']]),
+    }
+    for col in DIST_VARS:
+        specs[f'dist_{col}'] = (plot_distribution, df[col])
+    return specs
+
+
+# ---------- Rendering ----------
+def hash_input(name, data):
+    """Fingerprint a figure's input data (and the plot code version)."""
+    digest = hashlib.sha256(f'{name}:{RENDER_VERSION}'.encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    if isinstance(data, pd.DataFrame):
+        digest.update('|'.join(map(str, data.columns)).encode())
+    return digest.hexdigest()
+
+
+def render_figure(plotter, data, out_file):
+    """Worker entry point: draw one figure and write it to disk."""
+    fig, ax = plt.subplots(figsize=(8, 6))
+    try:
+        plotter(data, ax)
+        fig.tight_layout()
+        fig.savefig(out_file, dpi=120)
+    finally:
+        plt.close(fig)
+    return out_file
+
+
+def render_all(specs, fig_dir, jobs, force=False):
+    """Render stale figures in parallel; return (rendered, skipped) names."""
+    manifest_path = fig_dir / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    stale = {}
+    skipped = []
+    for name, (plotter, data) in specs.items():
+        digest = hash_input(name, data)
+        out_file = fig_dir / f'{name}.png'
+        if not force and manifest.get(name) == digest and out_file.exists():
+            skipped.append(name)
+        else:
+            stale[name] = (plotter, data, out_file, digest)
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                name: pool.submit(render_figure, plotter, data, out_file)
+                for name, (plotter, data, out_file, _) in stale.items()
+            }
+            for name, future in futures.items():
+                future.result()
+                manifest[name] = stale[name][3]
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return sorted(stale), skipped
+
+
+def write_tables(aggregates, table_dir):
+    for name, table in aggregates.items():
+        table.to_csv(table_dir / f'{name}.csv')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Render the EDA report headlessly'
+    )
+    parser.add_argument(
+        '--input',
+        type=str,
+        default='Data/processed/firearm_data_cleaned.csv',
+        help='Processed panel (CSV or Excel) [default: Data/processed/firearm_data_cleaned.csv]'
+    )
+    parser.add_argument(
+        '--out',
+        type=str,
+        default='reports',
+        help='Report root; figures go to <out>/figures/eda, tables to <out>/tables/eda [default: reports]'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=os.cpu_count(),
+        help='Number of worker processes used to render figures [default: all cores]'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-render every figure even if its inputs are unchanged'
+    )
+
+    args = parser.parse_args()
+
+    # ---------- Inputs ----------
+    in_path = Path(args.input)
+    if not in_path.exists():
+        print(f"Error: Missing input: {in_path}", file=sys.stderr)
+        sys.exit(1)
+
+    out_root = Path(args.out)
+    fig_dir = out_root / 'figures' / 'eda'
+    table_dir = out_root / 'tables' / 'eda'
+    cache_path = out_root / '.cache' / 'eda_aggregates.pkl'
+    fig_dir.mkdir(parents=True, exist_ok=True)
+    table_dir.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+
+    # ---------- Aggregates ----------
+    print(f"Loading {in_path}...")
+    source_hash = hashlib.sha256(in_path.read_bytes()).hexdigest()
+    df = load_panel(in_path)
+
+    aggregates, cache_hit = load_or_compute_aggregates(df, source_hash, cache_path)
+    print("Using cached aggregates" if cache_hit else "Computed aggregates")
+    write_tables(aggregates, table_dir)
+
+    # ---------- Figures ----------
+    rendered, skipped = render_all(figure_specs(df, aggregates), fig_dir, args.jobs, args.force)
+    print(f"Rendered {len(rendered)} figure(s), skipped {len(skipped)} unchanged")
+    for name in rendered:
+        print(f"Wrote: {fig_dir / name}.png")
+
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+Sparse state-year exposure matrices for the law table.
+
+01_clean_merge.py exports state-year x law_class_subtype and state-year x
+law_id matrices with these helpers: each is a CSR matrix of summed law
+scores saved as <stem>.npz, with its row labels (state_fips, state, year) in
+<stem>_rows.csv and its column labels in <stem>_cols.csv.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+from scipy import sparse
+
+from geography import normalize_state
+
+
+def build_exposure_matrix(active_laws, rows, key, value='law_score', state_col='state', year_col='year'):
+    """Sum `value` into a sparse (state-year x `key`) CSR matrix.
+
+    `active_laws` has one row per law in force in a state-year (as produced
+    by the grid/law merge in 01_clean_merge.py); `rows` fixes the row order.
+    Returns the matrix and its sorted column labels.
+    """
+    active_laws = active_laws.dropna(subset=[key, value])
+    row_index = pd.MultiIndex.from_frame(rows[[state_col, year_col]])
+    row_codes = row_index.get_indexer(
+        pd.MultiIndex.from_arrays([active_laws[state_col], active_laws[year_col]])
+    )
+    if (row_codes < 0).any():
+        raise ValueError("Active laws reference (state, year) rows missing from `rows`")
+    col_codes, columns = pd.factorize(active_laws[key], sort=True)
+
+    matrix = sparse.coo_matrix(
+        (active_laws[value].to_numpy(dtype='float32'), (row_codes, col_codes)),
+        shape=(len(rows), len(columns))
+    ).tocsr()  # duplicate (row, col) entries are summed
+    matrix.eliminate_zeros()
+    return matrix, list(columns)
+
+
+def save_exposure_matrix(stem, matrix, rows, columns):
+    """Write <stem>.npz plus <stem>_rows.csv and <stem>_cols.csv."""
+    stem = Path(stem)
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    sparse.save_npz(stem.with_suffix('.npz'), matrix)
+    rows.to_csv(f'{stem}_rows.csv', index=False)
+    pd.Series(columns, name='column').to_csv(f'{stem}_cols.csv', index=False)
+
+
+def load_exposure_matrix(stem, panel=None, state_col='state', year_col='year'):
+    """Load an exposure matrix as (CSR matrix, rows, columns).
+
+    If `panel` is given the matrix rows are reordered to match its
+    (state, year) rows, joining on FIPS codes so the panel's state column
+    may hold abbreviations, names or FIPS. The matrix is CSR, which sklearn
+    estimators and scipy.sparse.hstack accept as-is.
+    """
+    stem = Path(stem)
+    matrix = sparse.load_npz(stem.with_suffix('.npz')).tocsr()
+    rows = pd.read_csv(f'{stem}_rows.csv')
+    columns = pd.read_csv(f'{stem}_cols.csv', dtype=str)['column'].tolist()
+
+    if panel is not None:
+        panel_fips = normalize_state(panel[state_col]).astype('int64').to_numpy()
+        idx = pd.MultiIndex.from_arrays([rows['state_fips'], rows[year_col]]).get_indexer(
+            pd.MultiIndex.from_arrays([panel_fips, panel[year_col]])
+        )
+        if (idx < 0).any():
+            raise ValueError(f"{(idx < 0).sum()} panel rows have no exposure row in {stem}")
+        matrix = matrix[idx]
+        rows = panel[[state_col, year_col]].reset_index(drop=True)
+    return matrix, rows, columns
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+
+"""
+Build lag, lead, rolling-window and years-since-adoption features for the
+law-strength columns of the processed state-year panel.
+
+The panel is laid out as a dense (state x year x feature) cube so every
+feature is computed with array shifts and cumulative sums along the year
+axis instead of per-state loops. Missing state-years (e.g. DC before 2022)
+stay NaN, so no window ever reaches across a gap. Years since adoption come
+from the law table's effective years, so they reach back before the panel.
+
+Usage:
+    python scripts/py/features.py \
+        --input "Data/processed/firearm_data_cleaned.csv" \
+        --laws "Data/raw/TL-A243-2-v3 State Firearm Law Database 5.0.xlsx" \
+        --lags 1 2 3 --leads 1 --windows 3 5
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from geography import normalize_state
+from panel_io import clean_names, load_laws, load_panel
+
+
+# ---------- Cube layout ----------
+def to_cube(df, feature_cols, state_col='state', year_col='year'):
+    """Scatter panel rows into a (state, year, feature) float32 cube.
+
+    Returns the cube, the sorted state and year axes, and the (state, year)
+    positions of the original rows.
+    """
+    states, state_idx = np.unique(df[state_col].astype(str).to_numpy(), return_inverse=True)
+    year_values = df[year_col].to_numpy(dtype='int64')
+    years = np.arange(year_values.min(), year_values.max() + 1)
+    year_idx = year_values - years[0]
+
+    if pd.Series(state_idx * len(years) + year_idx).duplicated().any():
+        raise ValueError(f"Panel has duplicate ({state_col}, {year_col}) rows")
+
+    cube = np.full((len(states), len(years), len(feature_cols)), np.nan, dtype='float32')
+    cube[state_idx, year_idx, :] = df[feature_cols].to_numpy(dtype='float32')
+    return cube, states, years, (state_idx, year_idx)
+
+
+def shift(cube, periods):
+    """Shift along the year axis; positive = lag, negative = lead."""
+    out = np.full_like(cube, np.nan)
+    if periods > 0:
+        out[:, periods:, :] = cube[:, :-periods, :]
+    elif periods < 0:
+        out[:, :periods, :] = cube[:, -periods:, :]
+    else:
+        out[:] = cube
+    return out
+
+
+def rolling_sum(cube, window):
+    """Trailing sum over `window` years; NaN unless the full window is observed."""
+    valid = ~np.isnan(cube)
+    pad = np.zeros(cube.shape[:1] + (1,) + cube.shape[2:], dtype='float64')
+    total = np.concatenate([pad, np.nancumsum(cube, axis=1, dtype='float64')], axis=1)
+    count = np.concatenate([pad, np.cumsum(valid, axis=1, dtype='float64')], axis=1)
+
+    window_total = total[:, window:, :] - total[:, :-window, :]
+    window_count = count[:, window:, :] - count[:, :-window, :]
+
+    out = np.full_like(cube, np.nan)
+    out[:, window - 1:, :] = np.where(window_count == window, window_total, np.nan)
+    return out
+
+
+def adoption_events(law_data, prefix='strength_'):
+    """(state, feature, subtype, effective_year, repeal) for every dated
+    Implement, Modify or Repeal row in the law table.
+
+    Law classes are named the way 01_clean_merge.py names its strength
+    columns, e.g. "Carrying A Concealed Weapon (Ccw)" ->
+    strength_carrying_a_concealed_weapon_ccw.
+    """
+    events = law_data[['state', 'law_class', 'law_class_subtype', 'type_of_change', 'effective_date_year']]
+    events = events.dropna(subset=['state', 'law_class', 'effective_date_year'])
+    # "See note" rows have no clear direction and are left out
+    change = events['type_of_change'].astype(str).str.strip().str.lower()
+    known = change.isin(['implement', 'modify', 'repeal'])
+    events, change = events[known], change[known]
+    return pd.DataFrame({
+        'state': events['state'].to_numpy(),
+        'feature': clean_names(prefix + events['law_class'].astype(str).str.strip()),
+        'subtype': events['law_class_subtype'].fillna('').astype(str).str.strip().str.lower().to_numpy(),
+        'effective_year': events['effective_date_year'].to_numpy(dtype='int64'),
+        'repeal': (change == 'repeal').to_numpy(),
+    })
+
+
+def years_since_adoption(events, states, years, feature_cols):
+    """Years since the latest adoption of a law still in force in each
+    feature's class, as of each (state, year); NaN where none is in force.
+
+    A law is tracked per (class, subtype): Implement/Modify puts it in force,
+    a later Repeal takes it out. The class counts as adopted while any of
+    its subtypes is in force. Built by scattering effective years onto a
+    year axis that starts at the earliest law and taking running maxima, so
+    no per-state loop is needed.
+    """
+    # Align law states with the cube's state axis through FIPS codes
+    cube_fips = normalize_state(pd.Series(states)).astype('int64').to_numpy()
+    law_fips = normalize_state(events['state']).astype('int64').to_numpy()
+    state_pos = pd.Index(cube_fips).get_indexer(law_fips)
+    feature_pos = pd.Index(feature_cols).get_indexer(events['feature'])
+    effective = events['effective_year'].to_numpy(dtype='int64')
+    repeal = events['repeal'].to_numpy(dtype=bool)
+
+    keep = (state_pos >= 0) & (feature_pos >= 0) & (effective <= years[-1])
+    state_pos, feature_pos, effective, repeal = state_pos[keep], feature_pos[keep], effective[keep], repeal[keep]
+    # One slot per (feature, subtype); slot_feature maps slots back to features
+    slot_pos, slots = pd.factorize(pd.MultiIndex.from_arrays([feature_pos, events['subtype'].to_numpy()[keep]]))
+    slot_feature = slots.get_level_values(0).to_numpy(dtype='int64')
+
+    first = min(effective.min(), years[0]) if len(effective) else years[0]
+    shape = (len(slots), len(states), years[-1] - first + 1)
+    adopted = np.full(shape, -1, dtype='int64')
+    repealed = np.full(shape, -1, dtype='int64')
+    np.maximum.at(adopted, (slot_pos[~repeal], state_pos[~repeal], effective[~repeal] - first), effective[~repeal])
+    np.maximum.at(repealed, (slot_pos[repeal], state_pos[repeal], effective[repeal] - first), effective[repeal])
+    adopted = np.maximum.accumulate(adopted, axis=2)[:, :, years - first]
+    repealed = np.maximum.accumulate(repealed, axis=2)[:, :, years - first]
+
+    # Re-adopting in the year of a repeal keeps the law in force
+    in_force = np.where(adopted >= repealed, adopted, -1)
+    latest = np.full((len(feature_cols), len(states), len(years)), -1, dtype='int64')
+    np.maximum.at(latest, slot_feature, in_force)
+    latest = latest.transpose(1, 2, 0)
+
+    return np.where(latest >= 0, years.reshape(1, -1, 1) - latest, np.nan).astype('float32')
+
+
+# ---------- Feature builder ----------
+def build_features(df, feature_cols, lags=(1,), leads=(), windows=(), events=None,
+                   state_col='state', year_col='year'):
+    """Compute all derived features for `feature_cols` in one vectorized pass.
+
+    Years-since-adoption and 0/1 adopted columns are added when `events`
+    (from adoption_events()) is given. Returns a float32 matrix aligned to
+    the panel's rows sorted by (state, year), a DataFrame holding that row
+    index, and the column names.
+    """
+    cube, states, years, (state_idx, year_idx) = to_cube(df, feature_cols, state_col, year_col)
+
+    blocks = []
+    names = []
+    for k in lags:
+        blocks.append(shift(cube, k))
+        names.append([f'{col}_lag{k}' for col in feature_cols])
+    for k in leads:
+        blocks.append(shift(cube, -k))
+        names.append([f'{col}_lead{k}' for col in feature_cols])
+    for w in windows:
+        total = rolling_sum(cube, w)
+        blocks.append(total)
+        names.append([f'{col}_rollsum{w}' for col in feature_cols])
+        blocks.append(total / w)
+        names.append([f'{col}_rollmean{w}' for col in feature_cols])
+    if events is not None:
+        since = years_since_adoption(events, states, years, feature_cols)
+        blocks.append(since)
+        names.append([f'{col}_years_since_adoption' for col in feature_cols])
+        # No law in force is the only NaN in `since`; make it an explicit 0/1 column
+        blocks.append((~np.isnan(since)).astype('float32'))
+        names.append([f'{col}_adopted' for col in feature_cols])
+
+    # (state, year, block*feature) -> keep only the rows present in the panel
+    features = np.concatenate(blocks, axis=2)
+    order = np.lexsort((year_idx, state_idx))
+    X = np.ascontiguousarray(features[state_idx[order], year_idx[order], :], dtype='float32')
+
+    rows = pd.DataFrame({
+        state_col: states[state_idx[order]],
+        year_col: years[year_idx[order]]
+    })
+    columns = [name for block in names for name in block]
+    return X, rows, columns
+
+
+def save_features(path, X, rows, columns):
+    np.savez_compressed(
+        path,
+        X=X,
+        columns=np.asarray(columns),
+        # Store labels as fixed-width strings so the file loads without pickle
+        **{col: rows[col].to_numpy(dtype=None if rows[col].dtype.kind in 'iuf' else str) for col in rows.columns}
+    )
+
+
+def load_features(path, state_col='state', year_col='year'):
+    """Load a feature file written by this script as (X, rows, columns)."""
+    with np.load(path, allow_pickle=False) as data:
+        rows = pd.DataFrame({state_col: data[state_col], year_col: data[year_col]})
+        return data['X'], rows, data['columns'].tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Build lag/lead/rolling/years-since-adoption features for law-strength columns'
+    )
+    parser.add_argument(
+        '--input',
+        type=str,
+        default='Data/processed/firearm_data_cleaned.csv',
+        help='Processed panel (CSV or Excel) [default: Data/processed/firearm_data_cleaned.csv]'
+    )
+    parser.add_argument(
+        '--laws',
+        type=str,
+        default='Data/raw/TL-A243-2-v3 State Firearm Law Database 5.0.xlsx',
+        help='Firearm law workbook (or CSV export) for years since adoption '
+             '[default: Data/raw/TL-A243-2-v3 State Firearm Law Database 5.0.xlsx]'
+    )
+    parser.add_argument(
+        '--out',
+        type=str,
+        default='Data/processed/firearm_features.npz',
+        help='Output .npz with X, columns, state, year [default: Data/processed/firearm_features.npz]'
+    )
+    parser.add_argument(
+        '--prefix',
+        type=str,
+        default='strength_',
+        help='Build features for every column starting with this prefix [default: strength_]'
+    )
+    parser.add_argument('--lags', type=int, nargs='*', default=[1, 2, 3], help='Lag lengths in years [default: 1 2 3]')
+    parser.add_argument('--leads', type=int, nargs='*', default=[1], help='Lead lengths in years [default: 1]')
+    parser.add_argument('--windows', type=int, nargs='*', default=[3, 5], help='Rolling window lengths in years [default: 3 5]')
+
+    args = parser.parse_args()
+
+    for name in ['lags', 'leads', 'windows']:
+        bad = [k for k in getattr(args, name) if k < 1]
+        if bad:
+            print(f"Error: --{name} must be positive integers, got {bad}", file=sys.stderr)
+            sys.exit(1)
+
+    # ---------- Load ----------
+    in_path = Path(args.input)
+    laws_path = Path(args.laws)
+    for path in [in_path, laws_path]:
+        if not path.exists():
+            print(f"Error: Missing input: {path}", file=sys.stderr)
+            sys.exit(1)
+
+    print("Loading data...")
+    df = load_panel(in_path)
+    events = adoption_events(load_laws(laws_path), args.prefix)
+    feature_cols = [col for col in df.columns if col.startswith(args.prefix)]
+    if not feature_cols:
+        print(f"Error: No columns start with '{args.prefix}'", file=sys.stderr)
+        sys.exit(1)
+
+    # ---------- Build ----------
+    print(f"Building features for {len(feature_cols)} columns...")
+    X, rows, columns = build_features(df, feature_cols, args.lags, args.leads, args.windows, events)
+
+    # ---------- Save ----------
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    save_features(out_path, X, rows, columns)
+    print(f"Wrote: {out_path} ({X.shape[0]} rows x {X.shape[1]} features, {X.dtype})")
+
+
+if __name__ == '__main__':
+    main()
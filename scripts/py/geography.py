@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Shared state (and county) geography for the pipeline.
+
+States are identified by their integer FIPS code, held in a pandas
+categorical with a fixed category set (STATE_FIPS_DTYPE), so every dataset
+that goes through normalize_state() shares the same codes and merges on them
+are integer-key joins. Postal abbreviations, full names and FIPS codes (int
+or zero-padded string) are all accepted and resolved in one vectorized pass;
+anything that does not resolve raises instead of being filled in.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# (FIPS, postal abbreviation, name) for the 50 states and DC
+STATES = [
+    (1, 'AL', 'Alabama'), (2, 'AK', 'Alaska'), (4, 'AZ', 'Arizona'), (5, 'AR', 'Arkansas'),
+    (6, 'CA', 'California'), (8, 'CO', 'Colorado'), (9, 'CT', 'Connecticut'), (10, 'DE', 'Delaware'),
+    (11, 'DC', 'District of Columbia'), (12, 'FL', 'Florida'), (13, 'GA', 'Georgia'), (15, 'HI', 'Hawaii'),
+    (16, 'ID', 'Idaho'), (17, 'IL', 'Illinois'), (18, 'IN', 'Indiana'), (19, 'IA', 'Iowa'),
+    (20, 'KS', 'Kansas'), (21, 'KY', 'Kentucky'), (22, 'LA', 'Louisiana'), (23, 'ME', 'Maine'),
+    (24, 'MD', 'Maryland'), (25, 'MA', 'Massachusetts'), (26, 'MI', 'Michigan'), (27, 'MN', 'Minnesota'),
+    (28, 'MS', 'Mississippi'), (29, 'MO', 'Missouri'), (30, 'MT', 'Montana'), (31, 'NE', 'Nebraska'),
+    (32, 'NV', 'Nevada'), (33, 'NH', 'New Hampshire'), (34, 'NJ', 'New Jersey'), (35, 'NM', 'New Mexico'),
+    (36, 'NY', 'New York'), (37, 'NC', 'North Carolina'), (38, 'ND', 'North Dakota'), (39, 'OH', 'Ohio'),
+    (40, 'OK', 'Oklahoma'), (41, 'OR', 'Oregon'), (42, 'PA', 'Pennsylvania'), (44, 'RI', 'Rhode Island'),
+    (45, 'SC', 'South Carolina'), (46, 'SD', 'South Dakota'), (47, 'TN', 'Tennessee'), (48, 'TX', 'Texas'),
+    (49, 'UT', 'Utah'), (50, 'VT', 'Vermont'), (51, 'VA', 'Virginia'), (53, 'WA', 'Washington'),
+    (54, 'WV', 'West Virginia'), (55, 'WI', 'Wisconsin'), (56, 'WY', 'Wyoming'),
+]
+
+STATE_FIPS = np.array([fips for fips, _, _ in STATES], dtype='int64')
+STATE_ABBREVS = [abbrev for _, abbrev, _ in STATES]
+STATE_NAMES = [name for _, _, name in STATES]
+
+# Categories are in FIPS order, so category codes line up across all three
+STATE_FIPS_DTYPE = pd.CategoricalDtype(STATE_FIPS)
+STATE_ABBREV_DTYPE = pd.CategoricalDtype(STATE_ABBREVS)
+STATE_NAME_DTYPE = pd.CategoricalDtype(STATE_NAMES)
+
+# Every accepted spelling (upper-cased) -> position in STATES
+_ALIASES = {}
+for _i, (_fips, _abbrev, _name) in enumerate(STATES):
+    for _alias in (_abbrev, _name.upper(), str(_fips), f'{_fips:02d}'):
+        _ALIASES[_alias] = _i
+_ALIAS_INDEX = pd.Index(list(_ALIASES))
+_ALIAS_POS = np.array(list(_ALIASES.values()), dtype='int64')
+
+
+def _report(values, bad, what):
+    examples = pd.unique(pd.Series(values)[bad].astype(str))
+    shown = ', '.join(repr(v) for v in examples[:10])
+    more = f" (+{len(examples) - 10} more)" if len(examples) > 10 else ''
+    raise ValueError(f"{int(bad.sum())} value(s) are not recognised {what}: {shown}{more}")
+
+
+def normalize_state(values):
+    """Resolve abbreviations, names or FIPS codes to a STATE_FIPS_DTYPE Series.
+
+    Matching is case- and whitespace-insensitive. Missing or unrecognised
+    values raise ValueError listing the offending inputs.
+    """
+    values = pd.Series(values)
+    # Resolve each distinct spelling once, then broadcast back to the rows
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    keys = pd.Index(uniques).astype(str).str.strip().str.upper().str.replace(r'\.0$', '', regex=True)
+    hit = _ALIAS_INDEX.get_indexer(keys)
+    pos = np.where(hit >= 0, _ALIAS_POS[hit], -1)
+    positions = np.append(pos, -1)[codes]  # NaN rows (code -1) stay unresolved
+
+    bad = positions < 0
+    if bad.any():
+        _report(values, bad, 'as a state abbreviation, name or FIPS code')
+    return pd.Series(
+        pd.Categorical.from_codes(positions, dtype=STATE_FIPS_DTYPE),
+        index=values.index, name='state_fips'
+    )
+
+
+def state_abbrev(state_fips):
+    """Postal abbreviations for a STATE_FIPS_DTYPE Series (categorical)."""
+    return pd.Series(
+        pd.Categorical.from_codes(state_fips.cat.codes, dtype=STATE_ABBREV_DTYPE),
+        index=state_fips.index, name='state'
+    )
+
+
+def state_name(state_fips):
+    """Full state names for a STATE_FIPS_DTYPE Series (categorical)."""
+    return pd.Series(
+        pd.Categorical.from_codes(state_fips.cat.codes, dtype=STATE_NAME_DTYPE),
+        index=state_fips.index, name='state_name'
+    )
+
+
+def normalize_county(values, state=None):
+    """Resolve county FIPS codes to a categorical of 5-digit integer codes.
+
+    `values` are full 5-digit codes (int or string), or 3-digit county codes
+    when `state` (anything normalize_state() accepts) is given. The state
+    part must be a known state. No county list ships with the repo, so the
+    categories are the codes observed in `values`.
+    """
+    values = pd.Series(values)
+    text = values.astype(str).str.strip().str.replace(r'\.0$', '', regex=True)
+    bad = values.isna().to_numpy() | ~text.str.fullmatch(r'\d{1,5}').to_numpy()
+    if bad.any():
+        _report(values, bad, 'as county FIPS codes')
+    codes = text.astype('int64')
+
+    if state is not None:
+        if (codes > 999).any():
+            _report(values, (codes > 999).to_numpy(), 'as 3-digit county codes')
+        codes = normalize_state(state).astype('int64').to_numpy() * 1000 + codes.to_numpy()
+    codes = np.asarray(codes, dtype='int64')
+
+    bad = ~np.isin(codes // 1000, STATE_FIPS) | (codes % 1000 == 0)
+    if bad.any():
+        _report(values, bad, 'as county FIPS codes in a known state')
+    return pd.Series(
+        pd.Categorical(codes, categories=np.unique(codes)),
+        index=values.index, name='county_fips'
+    )
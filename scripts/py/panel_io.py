@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+
+"""
+Shared I/O helpers for the processed state-year panel and the law table.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+
+def load_panel(path):
+    """Read the processed panel from CSV or Excel."""
+    path = Path(path)
+    if path.suffix.lower() in ('.xlsx', '.xls'):
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+
+def load_laws(path, sheet='Database'):
+    """Read the RAND law database (workbook, or a CSV export of its sheet)
+    with snake-cased column names."""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        law_data = pd.read_csv(path)
+    else:
+        law_data = pd.read_excel(path, sheet_name=sheet)
+    law_data.columns = clean_names(law_data.columns)
+    return law_data
+
+
+def clean_names(columns):
+    """Snake-case column names the way janitor::clean_names does in the R pipeline."""
+    return (
+        pd.Index(columns).astype(str).str.lower()
+        .str.replace(r'[^0-9a-z]+', '_', regex=True)
+        .str.strip('_')
+    )
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+"""
+Golden-output regression check for the Python clean/merge pipeline.
+
+Runs scripts/py/01_clean_merge.py on the fixture inputs in Data/fixtures/inputs
+(all states, full law table), compares the panel and sparse exposure matrices
+column by column against the checked-in outputs in Data/fixtures/golden, and
+gates on time and memory. Exits non-zero if any output drifts beyond tolerance
+or if time or memory regress beyond --max-slowdown of the reference.
+
+Timing excludes interpreter startup and imports: a fresh worker process
+imports the pipeline, runs it once to warm up, then times main() in-process
+(best of --repeat) and measures peak allocation with tracemalloc on a further
+run. The reference is this host's entry in the local, untracked baseline
+file (reports/regression_baseline.json, written by --update-baseline) or,
+with --against REV, the pipeline at a git revision run the same way in the
+same invocation. A host without a baseline falls back to the merge-base of
+HEAD with origin/main (or main).
+
+The same comparison can be pointed at any two panels, e.g. to check the R and
+Python pipelines against each other on the full data.
+
+Usage:
+    python scripts/py/regression_check.py
+    python scripts/py/regression_check.py --against HEAD~1
+    python scripts/py/regression_check.py --update-baseline --against origin/main
+    python scripts/py/regression_check.py --update-golden
+    python scripts/py/regression_check.py --compare \
+        Data/processed/firearm_data_cleaned_new_py.csv Data/processed/firearm_data_cleaned_new.csv
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from panel_io import load_panel
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PIPELINE = '01_clean_merge.py'
+KEY_COLS = ['state', 'year']
+
+
+# ---------- Run ----------
+def host_key():
+    """Baselines are only comparable on the same machine and interpreter."""
+    return f"{platform.node()}-{platform.machine()}-py{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def pipeline_argv(fixtures, out_dir):
+    inputs = Path(fixtures) / 'inputs'
+    return [PIPELINE,
+            '--mortality', str(inputs / 'mortality.csv'),
+            '--laws', str(inputs / 'laws.csv'),
+            '--out', str(Path(out_dir) / 'panel.csv'),
+            '--sparse-dir', str(Path(out_dir) / 'sparse')]
+
+
+def measure(script_dir, argv, repeat):
+    """Time the pipeline's main() in this process; return wall_s and peak_mb.
+
+    Meant to run in a fresh worker process (see run_pipeline), so the
+    pipeline's sibling modules come from `script_dir` and not this checkout.
+    """
+    script_dir = Path(script_dir).resolve()
+    sys.path[:] = [str(script_dir)] + [p for p in sys.path if Path(p or '.').resolve() != SCRIPT_DIR]
+    for name, module in list(sys.modules.items()):
+        if name != '__main__' and Path(getattr(module, '__file__', None) or '/').parent == SCRIPT_DIR:
+            del sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location('clean_merge', script_dir / PIPELINE)
+    pipeline = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(pipeline)
+
+    def run():
+        sys.argv = list(argv)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pipeline.main()
+
+    run()  # warm-up: lazy imports inside pandas/scipy and the OS file cache
+    times = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    # tracemalloc slows allocation-heavy code, so peak memory gets its own run
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'wall_s': min(times), 'peak_mb': peak / 1024 ** 2}
+
+
+def run_pipeline(script_dir, fixtures, out_dir, repeat):
+    """Run measure() for the pipeline in `script_dir` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()),
+         '--worker', str(script_dir), str(out_dir),
+         '--fixtures', str(fixtures), '--repeat', str(repeat)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stdout + result.stderr, file=sys.stderr)
+        raise RuntimeError(f"Pipeline in {script_dir} failed with exit code {result.returncode}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def git(*args, binary=False):
+    """Run a git command from this checkout; raise RuntimeError on failure."""
+    try:
+        result = subprocess.run(['git', *args], cwd=SCRIPT_DIR, capture_output=True, check=True)
+    except FileNotFoundError:
+        raise RuntimeError("git is not installed")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"git {' '.join(args)} failed: {e.stderr.decode(errors='replace').strip()}")
+    return result.stdout if binary else result.stdout.decode().strip()
+
+
+def export_scripts(rev, dest):
+    """Extract scripts/py as of git revision `rev` into `dest`; return its path."""
+    root = Path(git('rev-parse', '--show-toplevel'))
+    subdir = SCRIPT_DIR.relative_to(root).as_posix()
+    try:
+        archive = git('-C', str(root), 'archive', '--format=tar', rev, subdir, binary=True)
+    except RuntimeError as e:
+        raise RuntimeError(f"Cannot read {subdir} at revision {rev!r} ({e})")
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest)
+    return Path(dest) / subdir
+
+
+def merge_base():
+    """Where this branch left main, or None if no main branch is known."""
+    for branch in ['origin/main', 'main']:
+        try:
+            return git('merge-base', 'HEAD', branch)[:7]
+        except RuntimeError:
+            continue
+    return None
+
+
+# ---------- Compare ----------
+def compare_frames(actual, expected, rtol, atol, keys=KEY_COLS):
+    """Column-by-column comparison; returns a list of human-readable problems."""
+    problems = []
+    missing = [c for c in expected.columns if c not in actual.columns]
+    extra = [c for c in actual.columns if c not in expected.columns]
+    if missing:
+        problems.append(f"missing columns: {missing}")
+    if extra:
+        problems.append(f"unexpected columns: {extra}")
+    if len(actual) != len(expected):
+        problems.append(f"row count {len(actual)} != {len(expected)}")
+        return problems
+
+    keys = [k for k in keys if k in actual.columns and k in expected.columns]
+    if keys:
+        actual = actual.sort_values(keys, kind='stable').reset_index(drop=True)
+        expected = expected.sort_values(keys, kind='stable').reset_index(drop=True)
+
+    for col in expected.columns:
+        if col not in actual.columns:
+            continue
+        a, e = actual[col], expected[col]
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(e):
+            a, e = a.to_numpy(dtype='float64'), e.to_numpy(dtype='float64')
+            bad = ~np.isclose(a, e, rtol=rtol, atol=atol, equal_nan=True)
+        else:
+            a, e = a.astype(str).to_numpy(), e.astype(str).to_numpy()
+            bad = a != e
+        if bad.any():
+            i = int(np.flatnonzero(bad)[0])
+            where = ', '.join(f"{k}={actual.at[i, k]}" for k in keys)
+            got, want = a[i:i + 1].tolist()[0], e[i:i + 1].tolist()[0]
+            problems.append(f"{col}: {int(bad.sum())} value(s) differ, first at [{where}] got {got!r} expected {want!r}")
+    return problems
+
+
+def compare_sparse(actual_dir, expected_dir, rtol, atol):
+    problems = []
+    for expected in sorted(expected_dir.glob('*.npz')):
+        actual = actual_dir / expected.name
+        if not actual.exists():
+            problems.append(f"{expected.name}: missing")
+            continue
+        for suffix in ['_rows.csv', '_cols.csv']:
+            name = expected.stem + suffix
+            diff = compare_frames(pd.read_csv(actual_dir / name), pd.read_csv(expected_dir / name), rtol, atol, keys=[])
+            problems += [f"{name}: {p}" for p in diff]
+        a, e = sparse.load_npz(actual).tocsr(), sparse.load_npz(expected).tocsr()
+        if a.shape != e.shape:
+            problems.append(f"{expected.name}: shape {a.shape} != {e.shape}")
+        elif abs(a - e).max() > atol + rtol * abs(e).max():
+            problems.append(f"{expected.name}: values differ (max abs diff {abs(a - e).max()})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Golden-output regression check for the Python pipeline'
+    )
+    parser.add_argument('--fixtures', type=str, default='Data/fixtures', help='Fixture root with inputs/ and golden/ [default: Data/fixtures]')
+    parser.add_argument('--rtol', type=float, default=1e-6, help='Relative tolerance for numeric columns [default: 1e-6]')
+    parser.add_argument('--atol', type=float, default=1e-9, help='Absolute tolerance for numeric columns [default: 1e-9]')
+    parser.add_argument('--max-slowdown', type=float, default=0.5, help='Fail if time or memory exceed the reference by this fraction [default: 0.5]')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed in-process runs; the fastest counts [default: 5]')
+    parser.add_argument('--against', type=str, metavar='REV', help='Time the pipeline at git revision REV in this invocation and use it as the reference')
+    parser.add_argument('--baseline', type=str, default='reports/regression_baseline.json', help='Per-host baselines, kept out of git [default: reports/regression_baseline.json]')
+    parser.add_argument('--history', type=str, default='reports/regression_history.jsonl', help='Append each run here [default: reports/regression_history.jsonl]')
+    parser.add_argument('--update-golden', action='store_true', help='Overwrite golden outputs with this run')
+    parser.add_argument('--update-baseline', action='store_true', help="Record this host's baseline (from --against REV if given) and exit")
+    parser.add_argument('--compare', nargs=2, metavar=('PANEL', 'REFERENCE'), help='Only compare two panels (CSV or Excel) and exit')
+    parser.add_argument('--worker', nargs=2, metavar=('SCRIPT_DIR', 'OUT_DIR'), help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.worker:
+        script_dir, out_dir = args.worker
+        print(json.dumps(measure(script_dir, pipeline_argv(args.fixtures, out_dir), args.repeat)))
+        return
+
+    if args.compare:
+        actual, expected = (load_panel(p) for p in args.compare)
+        problems = compare_frames(actual, expected, args.rtol, args.atol)
+        for p in problems:
+            print(f"  - {p}")
+        print("FAIL" if problems else f"OK: {len(expected.columns)} columns x {len(expected)} rows match")
+        sys.exit(1 if problems else 0)
+
+    # ---------- Inputs ----------
+    fixtures = Path(args.fixtures)
+    golden = fixtures / 'golden'
+    for path in [fixtures / 'inputs' / 'mortality.csv', fixtures / 'inputs' / 'laws.csv']:
+        if not path.exists():
+            print(f"Error: Missing input: {path}", file=sys.stderr)
+            sys.exit(1)
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {'hosts': {}}
+    host = host_key()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        # ---------- Reference ----------
+        rev = args.against
+        reference = baseline['hosts'].get(host)
+        if not rev and reference is None and not (args.update_golden or args.update_baseline):
+            # No baseline on this host: time where this branch left main instead
+            rev = merge_base()
+            if rev is None:
+                print(f"Error: No baseline for {host} in {baseline_path} and no main branch to compare against; "
+                      f"run with --update-baseline (optionally --against REV) or pass --against REV", file=sys.stderr)
+                sys.exit(1)
+        try:
+            if rev:
+                print(f"Reference: pipeline at {rev} (this run)")
+                reference = run_pipeline(export_scripts(rev, tmp / 'ref'), fixtures, tmp / 'ref_out', args.repeat)
+                print(f"  {reference['wall_s']:.3f}s wall (best of {args.repeat}), {reference['peak_mb']:.1f} MB peak alloc")
+            elif reference is not None and not args.update_baseline:
+                print(f"Reference: {host} baseline from {reference['rev']} ({reference['wall_s']:.3f}s, {reference['peak_mb']:.1f} MB)")
+
+            if args.update_baseline:
+                if not rev:
+                    rev = 'HEAD'
+                    reference = run_pipeline(SCRIPT_DIR, fixtures, tmp / 'ref_out', args.repeat)
+                baseline['hosts'][host] = {
+                    'rev': git('rev-parse', '--short', rev),
+                    'wall_s': round(reference['wall_s'], 4),
+                    'peak_mb': round(reference['peak_mb'], 1),
+                }
+                baseline_path.parent.mkdir(parents=True, exist_ok=True)
+                baseline_path.write_text(json.dumps(baseline, indent=2) + '\n')
+                print(f"Wrote: {baseline_path} ({host} from {baseline['hosts'][host]['rev']})")
+                return
+        except RuntimeError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        # ---------- Run ----------
+        out_dir = tmp / 'out'
+        run = run_pipeline(SCRIPT_DIR, fixtures, out_dir, args.repeat)
+        wall, peak_mb = run['wall_s'], run['peak_mb']
+        print(f"Pipeline: {wall:.3f}s wall (best of {args.repeat}), {peak_mb:.1f} MB peak alloc")
+
+        if args.update_golden:
+            shutil.rmtree(golden / 'sparse', ignore_errors=True)
+            golden.mkdir(parents=True, exist_ok=True)
+            shutil.copy(out_dir / 'panel.csv', golden / 'panel.csv')
+            shutil.copytree(out_dir / 'sparse', golden / 'sparse')
+            print(f"Wrote: {golden}")
+            return
+
+        if not (golden / 'panel.csv').exists():
+            print(f"Error: No golden outputs in {golden}; run with --update-golden", file=sys.stderr)
+            sys.exit(1)
+
+        # ---------- Compare ----------
+        problems = compare_frames(pd.read_csv(out_dir / 'panel.csv'), pd.read_csv(golden / 'panel.csv'), args.rtol, args.atol)
+        problems += compare_sparse(out_dir / 'sparse', golden / 'sparse', args.rtol, args.atol)
+
+    limit = 1 + args.max_slowdown
+    if wall > reference['wall_s'] * limit:
+        problems.append(f"runtime {wall:.3f}s exceeds reference {reference['wall_s']:.3f}s by more than {args.max_slowdown:.0%}")
+    if peak_mb > reference['peak_mb'] * limit:
+        problems.append(f"peak memory {peak_mb:.1f} MB exceeds reference {reference['peak_mb']:.1f} MB by more than {args.max_slowdown:.0%}")
+
+    # ---------- Record ----------
+    history = Path(args.history)
+    history.parent.mkdir(parents=True, exist_ok=True)
+    with open(history, 'a') as file:
+        file.write(json.dumps({
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'host': host,
+            'reference': rev or 'baseline',
+            'wall_s': round(wall, 4),
+            'peak_mb': round(peak_mb, 1),
+            'reference_wall_s': round(reference['wall_s'], 4),
+            'reference_peak_mb': round(reference['peak_mb'], 1),
+            'passed': not problems,
+        }) + '\n')
+
+    for p in problems:
+        print(f"  - {p}")
+    if problems:
+        print("FAIL")
+        sys.exit(1)
+    print("OK: outputs match golden and runtime is within threshold")
+
+
+if __name__ == '__main__':
+    main()